@@ -13,6 +13,11 @@ import subprocess
 import sys
 from pathlib import Path
 
+EXCLUDED_MODULES = ["tkinter", "pytest", "setuptools", "unittest", "pydoc", "pdb", "doctest"]
+if sys.platform.startswith("win"):
+    # Windows resolves process names and the single-instance lock through Win32 directly.
+    EXCLUDED_MODULES.append("psutil")
+
 
 def main():
     print("Building TF2 Queue Timer with PyInstaller...")
@@ -38,10 +43,14 @@ def main():
         "--icon", "icon.ico",
         "--add-data", f"icon.ico{data_sep}.",
         "--add-data", f"font.ttf{data_sep}.",
+        "--optimize", "2",  # strip asserts and docstrings from the bundled bytecode
         "--noconfirm",
         "--clean",
-        "main.py",
     ]
+    # Stdlib/dev modules the overlay never imports; keeps them out of _internal/
+    for module in EXCLUDED_MODULES:
+        cmd += ["--exclude-module", module]
+    cmd.append("main.py")
     
     print("Running PyInstaller...")
     result = subprocess.run(cmd)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import atexit
 import csv
+import functools
 import json
 import os
 import re
@@ -13,16 +14,43 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-import psutil
 from PySide6 import QtCore, QtGui, QtWidgets
 
 IS_WINDOWS = sys.platform.startswith("win")
 IS_LINUX = sys.platform.startswith("linux")
 
+# psutil, pywin32 and winreg are imported inside the functions that use them to keep them off the import path.
+
 if IS_WINDOWS:
-    import winreg
-    import win32gui
-    import win32process
+    import ctypes
+    from ctypes import wintypes
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    _kernel32.OpenProcess.restype = wintypes.HANDLE
+    _kernel32.QueryFullProcessImageNameW.argtypes = (
+        wintypes.HANDLE, wintypes.DWORD, wintypes.LPWSTR, ctypes.POINTER(wintypes.DWORD)
+    )
+    _kernel32.QueryFullProcessImageNameW.restype = wintypes.BOOL
+    _kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    _kernel32.CloseHandle.restype = wintypes.BOOL
+    _kernel32.CreateMutexW.argtypes = (wintypes.LPVOID, wintypes.BOOL, wintypes.LPCWSTR)
+    _kernel32.CreateMutexW.restype = wintypes.HANDLE
+    ERROR_ALREADY_EXISTS = 183
+
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WinEventProc = ctypes.WINFUNCTYPE(
+        None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND, wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+    )
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _user32.SetWinEventHook.argtypes = (
+        wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, WinEventProc, wintypes.DWORD, wintypes.DWORD, wintypes.DWORD
+    )
+    _user32.SetWinEventHook.restype = wintypes.HANDLE
+    _user32.UnhookWinEvent.argtypes = (wintypes.HANDLE,)
+    _user32.UnhookWinEvent.restype = wintypes.BOOL
 
 
 def get_app_dir() -> Path:
@@ -45,24 +73,57 @@ SETTINGS_PATH = APP_DIR / "settings.json"
 FONT_PATH = DATA_DIR / "font.ttf"
 ICON_PATH = DATA_DIR / "icon.ico"
 LOCK_PATH = APP_DIR / ".lock"
+SINGLETON_MUTEX_NAME = "Local\\TF2QueueTimer.singleton"
 
-DEFAULT_SETTINGS = {"pos": [24, 24], "opacity": 0.5, "font_size": 22, "save_csv": False, "wait_period": 20.0}
+DEFAULT_SETTINGS = {"pos": [24, 24], "opacity": 0.5, "font_size": 22, "save_csv": False, "wait_period": 20.0, "tf_dir": None, "max_log_mb": 0}
 CSV_PATH = APP_DIR / "queue_log.csv"
 TF2_PROCESS_NAMES = ["tf_win64.exe"] if IS_WINDOWS else ["tf_linux64", "hl2_linux"]
+_TF2_NAMES_LOWER = frozenset(name.lower() for name in TF2_PROCESS_NAMES)
+TF2_PID_CACHE_TTL = 5.0
+LOG_SAFETY_POLL_MS = 1000
 
+# One alternation per event, compiled ASCII-only and always applied with match(), which anchors at
+# the start of the line, so a line costs a single match() call. Queue-start lines are matched exactly;
+# match-found lines ignore case, and so does their part of the prefix gate below.
 QUEUE_START_PATTERN = re.compile(
-    r"^\[PartyClient\] (?:Requesting queue for|Entering queue for match group) .*Casual Match\b"
-    r"|^\[ReliableMsg\] PartyQueueForMatch started\b"
+    r"(?:"
+    r"\[PartyClient\] (?:Requesting queue for|Entering queue for match group) .*Casual Match\b"
+    r"|\[ReliableMsg\] PartyQueueForMatch started\b"
+    r")",
+    re.ASCII,
 )
 MATCH_FOUND_PATTERN = re.compile(
-    r"^\[PartyClient\] Leaving queue for match group .*Casual Match\b"
-    r"|^\[ReliableMsg\] AcceptLobbyInvite\b"
-    r"|^Lobby created\s*$"
-    r"|^Differing lobby received\.",
-    re.IGNORECASE,
+    r"(?:"
+    r"\[PartyClient\] Leaving queue for match group .*Casual Match\b"
+    r"|\[ReliableMsg\] AcceptLobbyInvite\b"
+    r"|Lobby created\s*$"
+    r"|Differing lobby received\."
+    r")",
+    re.ASCII | re.IGNORECASE,
 )
 
-MAP_PATTERN = re.compile(r"^Map:\s*([A-Za-z0-9_]+)")
+MAP_PATTERN = re.compile(r"Map:\s*([A-Za-z0-9_]+)", re.ASCII)
+
+# Literal prefixes that gate the regexes above; almost every console line fails these cheaply.
+QUEUE_START_PREFIXES = (
+    "[PartyClient] Requesting queue for",
+    "[PartyClient] Entering queue for match group",
+    "[ReliableMsg] PartyQueueForMatch started",
+)
+MATCH_FOUND_PREFIXES = (
+    "[PartyClient] Leaving queue for match group",
+    "[ReliableMsg] AcceptLobbyInvite",
+    "Lobby created",
+    "Differing lobby received",
+)
+# All prefixes folded into one anchored alternation, with only the match-found ones case-insensitive.
+# The bytes twin lets the log follower drop other lines before decoding them.
+_EVENT_PREFIX_SOURCE = (
+    "|".join(map(re.escape, ("Map:",) + QUEUE_START_PREFIXES))
+    + "|(?i:" + "|".join(map(re.escape, MATCH_FOUND_PREFIXES)) + ")"
+)
+EVENT_PREFIX_PATTERN = re.compile(_EVENT_PREFIX_SOURCE, re.ASCII)
+EVENT_PREFIX_PATTERN_BYTES = re.compile(_EVENT_PREFIX_SOURCE.encode("ascii"))
 
 def load_settings() -> dict:
     if SETTINGS_PATH.exists():
@@ -75,7 +136,16 @@ def load_settings() -> dict:
 
 def save_settings(settings: dict) -> None:
     try:
-        SETTINGS_PATH.write_text(json.dumps(settings, indent=2))
+        text = json.dumps(settings, indent=2)
+        try:
+            if SETTINGS_PATH.read_text() == text:
+                return
+        except OSError:
+            pass
+        # Write-then-rename so a crash mid-save never leaves a truncated settings.json behind.
+        tmp_path = SETTINGS_PATH.with_suffix(".tmp")
+        tmp_path.write_text(text)
+        os.replace(tmp_path, SETTINGS_PATH)
     except Exception:
         pass
 
@@ -104,14 +174,17 @@ def save_queue_to_csv(duration_seconds: float, map_name: Optional[str]) -> None:
 
 
 _xdotool_warned = False
+_tf2_pid_cache: dict[int, tuple[bool, float]] = {}
+_last_foreground: tuple[int, bool, float] = (0, False, 0.0)  # (hwnd, is_tf2, checked_at)
 
 
 def is_tf2_running() -> bool:
     try:
-        names = {name.lower() for name in TF2_PROCESS_NAMES}
+        import psutil
+
         for proc in psutil.process_iter(["name"]):
             name = (proc.info.get("name") or "").lower()
-            if name in names:
+            if name in _TF2_NAMES_LOWER:
                 return True
     except Exception:
         pass
@@ -142,14 +215,60 @@ def _get_focused_pid() -> Optional[int]:
         return None
 
 
+def _process_name(pid: int) -> str:
+    """Executable name of a process. Raises OSError if it cannot be queried."""
+    if IS_WINDOWS:
+        handle = _kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            raise ctypes.WinError(ctypes.get_last_error())
+        try:
+            size = wintypes.DWORD(260)
+            buf = ctypes.create_unicode_buffer(size.value)
+            if not _kernel32.QueryFullProcessImageNameW(handle, 0, buf, ctypes.byref(size)):
+                raise ctypes.WinError(ctypes.get_last_error())
+            return os.path.basename(buf.value)
+        finally:
+            _kernel32.CloseHandle(handle)
+    import psutil
+
+    try:
+        return psutil.Process(pid).name()
+    except psutil.Error as e:
+        raise OSError(str(e)) from e
+
+
+def _is_tf2_pid(pid: int) -> bool:
+    """Whether pid is TF2, memoized for a few seconds since the foreground process rarely changes."""
+    now = time.monotonic()
+    cached = _tf2_pid_cache.get(pid)
+    if cached is not None and now - cached[1] < TF2_PID_CACHE_TTL:
+        return cached[0]
+    is_tf2 = _process_name(pid).lower() in _TF2_NAMES_LOWER
+    if len(_tf2_pid_cache) >= 32:
+        _tf2_pid_cache.clear()
+    _tf2_pid_cache[pid] = (is_tf2, now)
+    return is_tf2
+
+
 def is_tf2_focused() -> bool:
+    global _last_foreground
     if IS_WINDOWS:
         try:
+            import win32gui
+            import win32process
+
             hwnd = win32gui.GetForegroundWindow()
             if not hwnd:
                 return False
+            # Same foreground window as last time: skip the PID lookup as well.
+            now = time.monotonic()
+            last_hwnd, last_is_tf2, checked_at = _last_foreground
+            if hwnd == last_hwnd and now - checked_at < TF2_PID_CACHE_TTL:
+                return last_is_tf2
             _, pid = win32process.GetWindowThreadProcessId(hwnd)
-            return psutil.Process(pid).name().lower() in {n.lower() for n in TF2_PROCESS_NAMES}
+            is_tf2 = _is_tf2_pid(pid)
+            _last_foreground = (hwnd, is_tf2, now)
+            return is_tf2
         except Exception:
             return False
     if shutil.which("xdotool") is None:
@@ -159,13 +278,15 @@ def is_tf2_focused() -> bool:
     if not pid:
         return is_tf2_running()
     try:
-        return psutil.Process(pid).name().lower() in {n.lower() for n in TF2_PROCESS_NAMES}
+        return _is_tf2_pid(pid)
     except Exception:
         return is_tf2_running()
 
 
 def get_steam_path() -> Optional[Path]:
     if IS_WINDOWS:
+        import winreg
+
         for root, subkey, value in [
             (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Valve\Steam", "InstallPath"),
             (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Valve\Steam", "InstallPath"),
@@ -205,17 +326,27 @@ def get_steam_path() -> Optional[Path]:
 
 def get_library_folders(steam_path: Path) -> list[Path]:
     libs = [steam_path]
+    seen = {steam_path}
     vdf_path = steam_path / "steamapps" / "libraryfolders.vdf"
     if not vdf_path.exists():
         return libs
     try:
         text = vdf_path.read_text(encoding="utf-8", errors="ignore")
-        strings = re.findall(r'"([^"]*)"', text)
-        for i, s in enumerate(strings):
-            if s.lower() == "path" and i + 1 < len(strings):
-                p = Path(strings[i + 1])
-                if p.exists() and p not in libs:
-                    libs.append(p)
+        # Only the value after each "path" key matters; scan for it instead of tokenizing every string.
+        i = 0
+        while True:
+            key = text.find('"path"', i)
+            if key < 0:
+                break
+            start = text.find('"', key + 6)
+            end = text.find('"', start + 1) if start >= 0 else -1
+            if end < 0:
+                break
+            p = Path(text[start + 1:end].replace("\\\\", "\\"))
+            if p not in seen and p.exists():
+                seen.add(p)
+                libs.append(p)
+            i = end + 1
     except Exception:
         pass
     return libs
@@ -241,89 +372,204 @@ def clear_console_log(log_path: Path) -> None:
 
 
 class ConsoleLogFollower:
-    def __init__(self, path: Path):
+    def __init__(self, path: Path, max_size: int = 0, line_filter: Optional[re.Pattern[bytes]] = None):
         self.path = path
-        self.f = None
-        self._last_size = 0
+        self.max_size = max_size  # trim the log once fully read past this many bytes; 0 disables
+        self.allow_trim = True  # cleared by the owner while it is waiting on an important line
+        self.line_filter = line_filter  # if set, only lines it matches at their start are returned
+        self._fd: Optional[int] = None
+        self._pos = 0  # our read offset, tracked here so an idle poll is a single fstat
+        self._tail = b""
+        self._from_start = False  # next open() reads a replaced log from the beginning
+        self._strip_nul = False  # set after a trim; see _trim_if_oversized
 
     def open(self) -> None:
-        self.f = open(self.path, "r", encoding="utf-8", errors="ignore")
-        self.f.seek(0, os.SEEK_END)
-        try:
-            self._last_size = self.path.stat().st_size
-        except OSError:
-            self._last_size = 0
+        # Raw descriptor: no Python buffering or text decoding layered on top of our own line split.
+        self._fd = os.open(self.path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        self._pos = os.lseek(self._fd, 0, os.SEEK_SET if self._from_start else os.SEEK_END)
+        self._from_start = False
+        self._tail = b""
 
     def close(self) -> None:
-        if self.f:
+        if self._fd is not None:
             try:
-                self.f.close()
-            except Exception:
+                os.close(self._fd)
+            except OSError:
                 pass
-            self.f = None
+            self._fd = None
+            self._tail = b""
 
-    def poll_lines(self, max_lines: int = 250) -> list[str]:
+    def check_replaced(self) -> bool:
+        """Close the log if its path no longer names the file we hold open (deleted or recreated).
+
+        poll_lines only fstats the open handle, so this by-name check is left to the caller's
+        change notifications and safety ticks. The next poll reopens the new file from its start.
+        """
+        if self._fd is None:
+            return False
         try:
-            if self.f is None:
+            held = os.fstat(self._fd)
+            current = os.stat(self.path)
+            if (current.st_ino, current.st_dev) == (held.st_ino, held.st_dev):
+                return False
+        except OSError:
+            pass
+        self.close()
+        self._from_start = True
+        return True
+
+    def poll_lines(self, chunk_size: int = 65536) -> list[str]:
+        try:
+            if self._fd is None:
                 self.open()
-            try:
-                current_size = self.path.stat().st_size
-                if current_size < self._last_size:
-                    self.close()
-                    self.open()
-                self._last_size = current_size
-            except OSError:
-                pass
-            lines = []
-            for _ in range(max_lines):
-                pos = self.f.tell()
-                line = self.f.readline()
-                if not line:
-                    self.f.seek(pos, os.SEEK_SET)
+            # fstat on the open handle avoids a by-name lookup every tick; an unchanged size means
+            # there is nothing to read, and a truncated log leaves our offset past its end.
+            size = os.fstat(self._fd).st_size
+            if size == self._pos:
+                return []
+            if size < self._pos:
+                self.close()
+                self.open()
+                return []
+            # Drain to EOF in as few reads as possible so a burst is never left waiting for the
+            # next change notification; an unterminated last line is held back until TF2 finishes it.
+            chunks = [self._tail]
+            while True:
+                chunk = os.read(self._fd, chunk_size)
+                self._pos += len(chunk)
+                chunks.append(chunk)
+                if len(chunk) < chunk_size:
                     break
-                lines.append(line.rstrip("\n"))
-            return lines
-        except (OSError, IOError):
+            data = b"".join(chunks)
+            if self._strip_nul:
+                if data[:1] == b"\0":
+                    # The writer kept its own offset, so every trim would cost a re-read of the
+                    # padding up to it; stop trimming for the rest of this session instead.
+                    self.max_size = 0
+                data = data.lstrip(b"\0")
+                self._strip_nul = not data
+            if data == self._tail:
+                return []
+            *lines, self._tail = data.split(b"\n")
+            if self.max_size and self.allow_trim and not self._tail:
+                self._trim_if_oversized()
+            if self.line_filter is not None:
+                # Filter the whole batch on raw bytes so uninteresting lines are never decoded.
+                match = self.line_filter.match
+                return [line.rstrip(b"\r").decode("utf-8", "ignore") for line in lines if match(line)]
+            return [line.rstrip(b"\r").decode("utf-8", "ignore") for line in lines]
+        except OSError:
             self.close()
             return []
 
+    def _trim_if_oversized(self) -> None:
+        """Empty the log once everything in it has been consumed, so it cannot grow without bound."""
+        if self._pos <= self.max_size or os.fstat(self._fd).st_size != self._pos:
+            return
+        try:
+            with open(self.path, "r+b") as f:
+                # Re-check through the writable handle right before truncating, so a line written
+                # since our read is not thrown away unread.
+                if f.seek(0, os.SEEK_END) != self._pos:
+                    return
+                f.truncate(0)
+        except OSError:
+            return  # TF2 (or something else) holds it without write sharing; try again next time
+        self._pos = os.lseek(self._fd, 0, os.SEEK_SET)
+        # A writer appending lands its next line at offset 0. One writing at its own offset leaves
+        # a run of NUL bytes before it instead, which would hide the line from the prefix filter;
+        # poll_lines strips that once and then turns trimming off.
+        self._strip_nul = True
+
+
+# Clamp for absurd durations; at most "99:99:99.9" (hours) is displayed.
+_MAX_DISPLAY_SECONDS = 99 * 3600 + 99 * 60 + 99.9
+
 
 def format_mmss_mmm(seconds: float) -> str:
-    seconds = max(0.0, min(seconds, 99 * 3600 + 99 * 60 + 99.9))
+    if not 0.0 <= seconds <= _MAX_DISPLAY_SECONDS:  # also true for NaN
+        seconds = _MAX_DISPLAY_SECONDS if seconds > 0.0 else 0.0
     total_ms = int(seconds * 1000.0)
-    total_secs = total_ms // 1000
-    hours, mins, secs = total_secs // 3600, (total_secs % 3600) // 60, total_secs % 60
-    ms = total_ms % 1000
-    if hours > 0:
-        return f"{hours:02d}:{mins:02d}:{secs:02d}.{ms // 100}"
-    return f"{mins:02d}:{secs:02d}.{ms:03d}"
+    if total_ms < 3_600_000:
+        mins, rem = divmod(total_ms, 60_000)
+        secs, ms = divmod(rem, 1000)
+        return "%02d:%02d.%03d" % (mins, secs, ms)
+    hours, rem = divmod(total_ms, 3_600_000)
+    mins, rem = divmod(rem, 60_000)
+    secs, ms = divmod(rem, 1000)
+    return "%02d:%02d:%02d.%d" % (hours, mins, secs, ms // 100)
 
 
 _cached_app_icon: Optional[QtGui.QIcon] = None
 
 
+@functools.cache
+def get_app_font_family() -> Optional[str]:
+    """Register the bundled font with Qt once per process and return its family name."""
+    if not FONT_PATH.exists():
+        return None
+    font_id = QtGui.QFontDatabase.addApplicationFont(str(FONT_PATH))
+    families = QtGui.QFontDatabase.applicationFontFamilies(font_id)
+    return families[0] if families else None
+
+
+def _draw_fallback_icon() -> QtGui.QIcon:
+    """Placeholder icon for running from a checkout without icon.ico."""
+    pix = QtGui.QPixmap(64, 64)
+    pix.fill(QtCore.Qt.GlobalColor.transparent)
+    p = QtGui.QPainter(pix)
+    p.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+    p.setBrush(QtGui.QColor(26, 26, 30, 255))
+    p.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255, 170), 2))
+    p.drawRoundedRect(8, 8, 48, 48, 12, 12)
+    p.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255, 220), 3))
+    p.drawLine(22, 34, 32, 44)
+    p.drawLine(32, 44, 46, 24)
+    p.end()
+    return QtGui.QIcon(pix)
+
+
 def get_app_icon() -> QtGui.QIcon:
     global _cached_app_icon
     if _cached_app_icon is not None:
         return _cached_app_icon
     if ICON_PATH.exists():
         _cached_app_icon = QtGui.QIcon(str(ICON_PATH))
+    elif hasattr(sys, "frozen"):
+        # build.py always bundles icon.ico; don't paint one at runtime in release builds.
+        _cached_app_icon = QtGui.QIcon()
     else:
-        pix = QtGui.QPixmap(64, 64)
-        pix.fill(QtCore.Qt.GlobalColor.transparent)
-        p = QtGui.QPainter(pix)
-        p.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
-        p.setBrush(QtGui.QColor(26, 26, 30, 255))
-        p.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255, 170), 2))
-        p.drawRoundedRect(8, 8, 48, 48, 12, 12)
-        p.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255, 220), 3))
-        p.drawLine(22, 34, 32, 44)
-        p.drawLine(32, 44, 46, 24)
-        p.end()
-        _cached_app_icon = QtGui.QIcon(pix)
+        _cached_app_icon = _draw_fallback_icon()
     return _cached_app_icon
 
 
+def render_card_shadow(size: QtCore.QSize, radius: float = 14, blur_radius: float = 24, offset: int = 10) -> QtGui.QPixmap:
+    """Blurred rounded-rect shadow for the overlay card, rendered once per window size."""
+    shape = QtGui.QImage(size, QtGui.QImage.Format.Format_ARGB32_Premultiplied)
+    shape.fill(QtCore.Qt.GlobalColor.transparent)
+    p = QtGui.QPainter(shape)
+    p.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+    p.setPen(QtCore.Qt.PenStyle.NoPen)
+    # Shadow alpha 110 scaled by the card's own background alpha (165), as the drop-shadow effect did.
+    p.setBrush(QtGui.QColor(0, 0, 0, 110 * 165 // 255))
+    p.drawRoundedRect(QtCore.QRectF(0, offset, size.width(), size.height()), radius, radius)
+    p.end()
+
+    scene = QtWidgets.QGraphicsScene()
+    item = scene.addPixmap(QtGui.QPixmap.fromImage(shape))
+    blur = QtWidgets.QGraphicsBlurEffect()
+    blur.setBlurRadius(blur_radius)
+    item.setGraphicsEffect(blur)
+
+    out = QtGui.QPixmap(size)
+    out.fill(QtCore.Qt.GlobalColor.transparent)
+    p = QtGui.QPainter(out)
+    rect = QtCore.QRectF(0, 0, size.width(), size.height())
+    scene.render(p, rect, rect)
+    p.end()
+    return out
+
+
 class SettingsDialog(QtWidgets.QDialog):
     def __init__(self, overlay: "OverlayWindow", parent=None):
         super().__init__(parent)
@@ -331,7 +577,6 @@ class SettingsDialog(QtWidgets.QDialog):
         self.settings = overlay.settings.copy()
         
         self.setWindowTitle("Settings")
-        self.setWindowIcon(get_app_icon())
         self.setFixedWidth(300)
         
         layout = QtWidgets.QVBoxLayout(self)
@@ -435,25 +680,29 @@ class SettingsDialog(QtWidgets.QDialog):
 
 
 class OverlayWindow(QtWidgets.QWidget):
-    _STATUS_STYLES = {
-        "IDLE": "QLabel#StatusPill { padding: 4px 10px; border-radius: 999px; color: rgba(255,255,255,230); background-color: rgba(120,120,120,95); border: 1px solid rgba(255,255,255,45); min-width: 110px; }",
-        "QUEUEING": "QLabel#StatusPill { padding: 4px 10px; border-radius: 999px; color: rgba(255,255,255,230); background-color: rgba(255,193,7,100); border: 1px solid rgba(255,255,255,45); min-width: 110px; }",
-        "MATCH FOUND": "QLabel#StatusPill { padding: 4px 10px; border-radius: 999px; color: rgba(255,255,255,230); background-color: rgba(76,175,80,100); border: 1px solid rgba(255,255,255,45); min-width: 110px; }",
-    }
-
     def __init__(self, log_path: Path):
         super().__init__()
         self.settings = load_settings()
         self.status = "IDLE"
         self._last_status = ""
+        self._last_timer_text = ""
+        self._last_timer_len = 0
+        self._last_map_text = ""
         self.queue_start_perf: Optional[float] = None
         self.last_match_found_seconds = 0.0
         self.map_name: Optional[str] = None
-        self.follower = ConsoleLogFollower(log_path)
+        self._pending_csv_duration: Optional[float] = None
+        self.follower = ConsoleLogFollower(
+            log_path, max(0, int(float(self.settings["max_log_mb"]) * 1024 * 1024)), line_filter=EVENT_PREFIX_PATTERN_BYTES
+        )
+        # Open now so the first change notification reads the new lines instead of seeking past them.
+        try:
+            self.follower.open()
+        except OSError:
+            pass
 
         self.setObjectName("Root")
         self.setWindowTitle("TF2 Queue Timer")
-        self.setWindowIcon(get_app_icon())
         self.setWindowFlags(
             QtCore.Qt.WindowType.FramelessWindowHint
             | QtCore.Qt.WindowType.Tool
@@ -464,46 +713,53 @@ class OverlayWindow(QtWidgets.QWidget):
         self.setWindowOpacity(float(self.settings["opacity"]))
         self.move(*self.settings["pos"])
 
-        self._load_font()
+        self._font_cache: dict[tuple[int, bool], QtGui.QFont] = {}
+        self.font_family = get_app_font_family()
         self._build_ui()
 
+        # The log is read when Qt's watcher reports a change. On Windows that is a directory
+        # FindFirstChangeNotification plus a lastModified/permissions comparison, so a write can go
+        # unreported until TF2's handle is flushed; the poll therefore stays fast while queueing and
+        # otherwise only guards against dropped notifications.
+        self.log_watcher = QtCore.QFileSystemWatcher(self)
+        self.log_watcher.fileChanged.connect(self._on_log_changed)
+        self._log_watched = self.log_watcher.addPath(str(log_path))
+        self._last_log_check = 0.0
+
         self.poll_timer = QtCore.QTimer(self)
-        self.poll_timer.timeout.connect(self._on_poll_tick)
-        self.poll_timer.start(100)
+        self.poll_timer.timeout.connect(self._on_poll_timer)
+        self.poll_timer.start(self._poll_interval())
 
         self.ui_timer = QtCore.QTimer(self)
         self.ui_timer.timeout.connect(self._update_ui)
 
+        # On Windows focus changes are pushed by a WinEvent hook; the timer is only a safety net there.
+        self._fg_hook = None
+        self._fg_hook_proc = None
+        if IS_WINDOWS:
+            self._install_foreground_hook()
         self.proc_timer = QtCore.QTimer(self)
         self.proc_timer.timeout.connect(self._sync_visibility)
-        self.proc_timer.start(500)
+        self.proc_timer.start(5000 if self._fg_hook else 500)
         self._sync_visibility()
 
-        self._pending_csv_duration: Optional[float] = None
-
-    def _load_font(self):
-        self.font_family = None
-        if FONT_PATH.exists():
-            font_id = QtGui.QFontDatabase.addApplicationFont(str(FONT_PATH))
-            families = QtGui.QFontDatabase.applicationFontFamilies(font_id)
-            if families:
-                self.font_family = families[0]
-
     def _font(self, size: int, bold: bool = False) -> QtGui.QFont:
-        f = QtGui.QFont(self.font_family or "Segoe UI")
-        f.setPointSize(size)
-        f.setBold(bold)
-        f.setStyleStrategy(QtGui.QFont.StyleStrategy.PreferAntialias)
+        key = (size, bold)
+        f = self._font_cache.get(key)
+        if f is None:
+            f = QtGui.QFont(self.font_family or "Segoe UI")
+            f.setPointSize(size)
+            f.setBold(bold)
+            f.setStyleStrategy(QtGui.QFont.StyleStrategy.PreferAntialias)
+            self._font_cache[key] = f
         return f
 
     def _build_ui(self):
         self.card = QtWidgets.QFrame(self)
         self.card.setObjectName("Card")
-        shadow = QtWidgets.QGraphicsDropShadowEffect(self.card)
-        shadow.setBlurRadius(24)
-        shadow.setOffset(0, 10)
-        shadow.setColor(QtGui.QColor(0, 0, 0, 110))
-        self.card.setGraphicsEffect(shadow)
+        # The card shadow is painted from a cached pixmap in paintEvent; a QGraphicsDropShadowEffect
+        # would re-render and blur the whole card on the CPU for every repaint of the timer.
+        self._shadow_pixmap: Optional[QtGui.QPixmap] = None
 
         root = QtWidgets.QVBoxLayout(self)
         root.setContentsMargins(0, 0, 0, 0)
@@ -543,43 +799,107 @@ class OverlayWindow(QtWidgets.QWidget):
             QLabel#Timer { color: rgba(255,255,255,240); }
             QLabel#Meta { color: rgba(255,255,255,175); }
             QLabel#StatusPill { padding: 4px 10px; border-radius: 999px; color: rgba(255,255,255,230); background-color: rgba(120,120,120,95); border: 1px solid rgba(255,255,255,45); min-width: 110px; }
+            QLabel#StatusPill[state="QUEUEING"] { background-color: rgba(255,193,7,100); }
+            QLabel#StatusPill[state="MATCH FOUND"] { background-color: rgba(76,175,80,100); }
         """)
         self._update_ui()
 
+    def _install_foreground_hook(self):
+        self._fg_hook_proc = WinEventProc(self._on_foreground_change)
+        self._fg_hook = _user32.SetWinEventHook(
+            EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND, None, self._fg_hook_proc, 0, 0, WINEVENT_OUTOFCONTEXT
+        )
+        if not self._fg_hook:
+            self._fg_hook_proc = None
+            return
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._remove_foreground_hook)
+
+    def _remove_foreground_hook(self):
+        if self._fg_hook:
+            _user32.UnhookWinEvent(self._fg_hook)
+            self._fg_hook = None
+            self._fg_hook_proc = None
+
+    def _on_foreground_change(self, hook, event, hwnd, id_object, id_child, thread_id, event_time):
+        self._sync_visibility()
+
     def _sync_visibility(self):
         if is_tf2_focused():
+            polling = self.poll_timer.isActive()
             if not self.isVisible():
                 self.show()
+                self._update_timers()
+            if not polling:
+                self._sync_poll_timer()
+                self._on_poll_tick()
             self.raise_()
-        elif self.isVisible():
+            return
+        if self.isVisible():
             self.hide()
+            self._update_timers()
+        elif self.poll_timer.isActive():
+            self._sync_poll_timer()
+
+    def _on_log_changed(self, path: str = ""):
+        """Change notification or safety tick: follow a replaced log, keep the watch armed, then read."""
+        self._last_log_check = time.monotonic()
+        self.follower.check_replaced()
+        log_path = str(self.follower.path)
+        if log_path not in self.log_watcher.files():
+            # Backends drop the watch when the file is deleted, and re-adding fails until it exists
+            # again; fall back to fast polling meanwhile.
+            self._log_watched = self.log_watcher.addPath(log_path)
+            self._sync_poll_timer()
+        self._on_poll_tick()
+
+    def _on_poll_timer(self):
+        # Fast ticks while queueing only fstat the open log; the by-name checks keep the safety cadence.
+        if time.monotonic() - self._last_log_check >= LOG_SAFETY_POLL_MS / 1000:
+            self._on_log_changed()
+        else:
+            self._on_poll_tick()
 
     def _on_poll_tick(self):
+        # Never trim while a queue-start/match-found or the map line for a pending CSV row can arrive.
+        self.follower.allow_trim = self.status != "QUEUEING" and self._pending_csv_duration is None
         for line in self.follower.poll_lines():
             self._handle_line(line)
 
     def _handle_line(self, line: str):
-        m = MAP_PATTERN.search(line)
-        if m:
-            self.map_name = m.group(1)
-            self._update_ui()
+        if not EVENT_PREFIX_PATTERN.match(line):
+            return
+        if line.startswith("Map:"):
+            # Plain map names ("Map: ctf_2fort") need no regex; anything unusual goes through MAP_PATTERN.
+            name = line[4:].strip()
+            if not (name.isascii() and name.replace("_", "").isalnum()):
+                m = MAP_PATTERN.match(line)
+                name = m.group(1) if m else ""
+            if name:
+                self.map_name = name
+                self._update_ui()
             return
-        if QUEUE_START_PATTERN.search(line):
+        if line.startswith(QUEUE_START_PREFIXES) and QUEUE_START_PATTERN.match(line):
             self.status = "QUEUEING"
             self.queue_start_perf = time.perf_counter()
             self.last_match_found_seconds = 0.0
             self.map_name = None
             self._update_timers()
             return
-        if self.status == "QUEUEING" and self.queue_start_perf and MATCH_FOUND_PATTERN.search(line):
+        if (
+            self.status == "QUEUEING"
+            and self.queue_start_perf
+            and MATCH_FOUND_PATTERN.match(line)
+        ):
             self.status = "MATCH FOUND"
             self.last_match_found_seconds = time.perf_counter() - self.queue_start_perf
             self.queue_start_perf = None
-            self._update_timers()
             if self.settings.get("save_csv", False):
                 self._pending_csv_duration = self.last_match_found_seconds
                 wait_ms = int(self.settings.get("wait_period", 20.0) * 1000)
                 QtCore.QTimer.singleShot(wait_ms, self._save_pending_csv)
+            self._update_timers()
 
     def _save_pending_csv(self):
         """Save CSV after delay to allow map name detection."""
@@ -588,17 +908,39 @@ class OverlayWindow(QtWidgets.QWidget):
             if self.map_name:
                 save_queue_to_csv(self._pending_csv_duration, self.map_name)
             self._pending_csv_duration = None
+            self._sync_poll_timer()
 
     def _update_timers(self):
-        if self.status == "QUEUEING":
-            self.poll_timer.setInterval(50)
+        self._sync_poll_timer()
+        # Only a running queue changes the text on its own, and only a visible overlay needs repainting.
+        if self.status == "QUEUEING" and self.isVisible():
             if not self.ui_timer.isActive():
-                self.ui_timer.start(16)
-        else:
-            self.poll_timer.setInterval(100)
-            if self.ui_timer.isActive():
-                self.ui_timer.stop()
+                self.ui_timer.start(100)
                 self._update_ui()
+        elif self.ui_timer.isActive():
+            self.ui_timer.stop()
+            self._update_ui()
+
+    def _sync_poll_timer(self):
+        # The watcher alone can miss or delay a write, so the poll also keeps running while hidden
+        # when a match-found or the map line for a pending CSV row can still arrive.
+        if not (
+            self.isVisible()
+            or not self._log_watched
+            or self.status == "QUEUEING"
+            or self._pending_csv_duration is not None
+        ):
+            self.poll_timer.stop()
+            return
+        if self.poll_timer.interval() != self._poll_interval():
+            self.poll_timer.setInterval(self._poll_interval())
+        if not self.poll_timer.isActive():
+            self.poll_timer.start()
+
+    def _poll_interval(self) -> int:
+        if self.status == "QUEUEING":
+            return 50
+        return LOG_SAFETY_POLL_MS if self._log_watched else 100
 
     def _elapsed_seconds(self) -> float:
         if self.status == "QUEUEING" and self.queue_start_perf:
@@ -608,13 +950,33 @@ class OverlayWindow(QtWidgets.QWidget):
         return 0.0
 
     def _update_ui(self):
-        self.timer_label.setText("--:--.---" if self.status == "IDLE" else format_mmss_mmm(self._elapsed_seconds()))
+        relayout = False
+        timer_text = "--:--.---" if self.status == "IDLE" else format_mmss_mmm(self._elapsed_seconds())
+        if timer_text != self._last_timer_text:
+            self.timer_label.setText(timer_text)
+            self._last_timer_text = timer_text
+            # Digit changes keep the label's size hint; only re-layout when the format widens or narrows,
+            # e.g. "59:59.999" -> "01:00:00.0". The layout still grows the window if a hint increases.
+            if len(timer_text) != self._last_timer_len:
+                self._last_timer_len = len(timer_text)
+                relayout = True
         if self.status != self._last_status:
             self.status_pill.setText(self.status)
-            self.status_pill.setStyleSheet(self._STATUS_STYLES[self.status])
+            # Switch colours via the [state] selectors in the window stylesheet; re-polishing
+            # is far cheaper than parsing a per-widget stylesheet on every transition.
+            self.status_pill.setProperty("state", self.status)
+            style = self.status_pill.style()
+            style.unpolish(self.status_pill)
+            style.polish(self.status_pill)
             self._last_status = self.status
-        self.map_label.setText(f"Map: {self.map_name}" if self.map_name else "Map: —")
-        self.adjustSize()
+            relayout = True
+        map_text = f"Map: {self.map_name}" if self.map_name else "Map: —"
+        if map_text != self._last_map_text:
+            self.map_label.setText(map_text)
+            self._last_map_text = map_text
+            relayout = True
+        if relayout:
+            self.adjustSize()
 
     def reset_timer(self):
         self.status = "IDLE"
@@ -628,10 +990,21 @@ class OverlayWindow(QtWidgets.QWidget):
         dialog = SettingsDialog(self)
         dialog.exec()
 
+    def resizeEvent(self, event: QtGui.QResizeEvent):
+        self._shadow_pixmap = None
+        super().resizeEvent(event)
+
+    def paintEvent(self, event: QtGui.QPaintEvent):
+        if self._shadow_pixmap is None:
+            self._shadow_pixmap = render_card_shadow(self.size())
+        p = QtGui.QPainter(self)
+        p.drawPixmap(0, 0, self._shadow_pixmap)
+        p.end()
+
 
-def build_tray(app: QtWidgets.QApplication, window: OverlayWindow) -> QtWidgets.QSystemTrayIcon:
+def build_tray(app: QtWidgets.QApplication, window: OverlayWindow, icon: QtGui.QIcon) -> QtWidgets.QSystemTrayIcon:
     tray = QtWidgets.QSystemTrayIcon(app)
-    tray.setIcon(get_app_icon())
+    tray.setIcon(icon)
     tray.setToolTip("TF2 Queue Timer Overlay")
     menu = QtWidgets.QMenu()
     menu.addAction("Settings...").triggered.connect(window.show_settings)
@@ -643,8 +1016,18 @@ def build_tray(app: QtWidgets.QApplication, window: OverlayWindow) -> QtWidgets.
     return tray
 
 
+_singleton_mutex = None
+
+
 def acquire_lock() -> bool:
+    global _singleton_mutex
+    if IS_WINDOWS:
+        # A named mutex is one syscall and disappears with the process, so there is no stale lock to probe.
+        _singleton_mutex = _kernel32.CreateMutexW(None, False, SINGLETON_MUTEX_NAME)
+        return not _singleton_mutex or ctypes.get_last_error() != ERROR_ALREADY_EXISTS
     try:
+        import psutil
+
         if LOCK_PATH.exists():
             try:
                 old_pid = int(LOCK_PATH.read_text().strip())
@@ -672,40 +1055,45 @@ def release_lock() -> None:
 
 
 def main():
+    app = QtWidgets.QApplication([])
+    # Top-level windows (overlay, settings, message boxes) inherit the application icon.
+    icon = get_app_icon()
+    app.setWindowIcon(icon)
+
     if not acquire_lock():
-        app = QtWidgets.QApplication([])
-        app.setWindowIcon(get_app_icon())
         QtWidgets.QMessageBox.warning(None, "TF2 Queue Timer", "Another instance is already running.\nCheck your system tray.")
         sys.exit(0)
 
     atexit.register(release_lock)
     ensure_settings_file()
 
-    tf_dir = find_tf2_tf_dir()
+    # The install location is remembered so warm starts skip the registry and library probing.
+    settings = load_settings()
+    cached_tf_dir = settings.get("tf_dir")
+    tf_dir = Path(cached_tf_dir) if cached_tf_dir else None
+    if tf_dir is None or not tf_dir.is_dir():
+        tf_dir = find_tf2_tf_dir()
+        if (str(tf_dir) if tf_dir else None) != cached_tf_dir:
+            settings["tf_dir"] = str(tf_dir) if tf_dir else None
+            save_settings(settings)
     if not tf_dir:
-        app = QtWidgets.QApplication([])
-        app.setWindowIcon(get_app_icon())
         QtWidgets.QMessageBox.critical(None, "TF2 Queue Timer", "Could not find TF2 installation.\nMake sure TF2 is installed via Steam.")
         sys.exit(1)
 
     log_path = tf_dir / "console.log"
     if not log_path.exists():
-        app = QtWidgets.QApplication([])
-        app.setWindowIcon(get_app_icon())
         QtWidgets.QMessageBox.warning(None, "TF2 Queue Timer",
             f"TF2 console.log was not found.\n\nAdd -condebug to TF2 launch options:\nSteam → Library → TF2 → Properties → Launch Options\n\nExpected: {tf_dir}\\console.log")
         sys.exit(1)
 
     clear_console_log(log_path)
 
-    app = QtWidgets.QApplication([])
-    app.setWindowIcon(get_app_icon())
     app.setQuitOnLastWindowClosed(False)
 
     window = OverlayWindow(log_path)
     window.hide()
 
-    tray = build_tray(app, window)
+    tray = build_tray(app, window, icon)
     QtCore.QTimer.singleShot(400, lambda: tray.showMessage("TF2 Queue Timer started", "Running in the system tray.\nRight-click the tray icon for options.", QtWidgets.QSystemTrayIcon.MessageIcon.Information, 6000) if tray.supportsMessages() else None)
 
     sys.exit(app.exec())